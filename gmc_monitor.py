@@ -2,18 +2,31 @@
 import time
 import json
 import logging
+import mmap
 import serial
 import paho.mqtt.client as mqtt
-import ssl
-import csv
-from threading import Event
+import queue
+import selectors
+import signal
+from threading import Event, Thread
 from datetime import datetime
 import os
+import struct
 import sys
 
+try:
+    import orjson  # Optional, faster JSON serialization
+except ImportError:
+    orjson = None
+
 class GMC300EPlus:
     """Direct serial communication with GMC-300E Plus using GQ-RFC1201 protocol"""
     
+    # Fixed-size binary responses
+    CPM_RESPONSE = struct.Struct('>H')
+    VOLT_RESPONSE = struct.Struct('B')
+    DATETIME_RESPONSE = struct.Struct('7B')
+    
     def __init__(self, port='/dev/ttyUSB0', timeout=3):
         self.ser = serial.Serial(
             port=port,
@@ -26,47 +39,107 @@ class GMC300EPlus:
             rtscts=False,
             dsrdtr=False
         )
+        self.timeout = timeout
+        self.version = None
+        
+        # Wait on the port's file descriptor directly rather than pyserial's read loop
+        self._sel = selectors.DefaultSelector()
+        self._sel.register(self.ser.fileno(), selectors.EVENT_READ)
         time.sleep(0.5)  # Allow port to settle
+        
+        # Discard anything left over from a previous session; done once per
+        # connection so responses to our own commands are never flushed
+        self.ser.reset_input_buffer()
+        self.ser.reset_output_buffer()
+        self._needs_resync = False
+    
+    def resync(self):
+        """Discard pending input now and again before the next command
+        
+        Called after a failed or short exchange so a late reply is never
+        read as the response to a later command.
+        """
+        self._needs_resync = True
+        try:
+            self.ser.reset_input_buffer()
+        except Exception:
+            pass
     
     def send_command(self, command, expected_length=None):
         """Send command and return response with error handling"""
         try:
-            self.ser.reset_input_buffer()
-            self.ser.reset_output_buffer()
-            
-            self.ser.write(command.encode('ascii'))
+            if isinstance(command, str):
+                command = command.encode('ascii')
+            if self._needs_resync:
+                self.ser.reset_input_buffer()
+                self._needs_resync = False
+            self.ser.write(command)
             self.ser.flush()
-            time.sleep(0.5)  # Allow device to process
             
             if expected_length:
-                response = self.ser.read(expected_length)
+                response = self._read(expected_length)
             else:
-                response = self.ser.read_all()
+                response = self._read(1)
+                if response and self.ser.in_waiting:
+                    response += self._read(self.ser.in_waiting)
                 
             return response
         except Exception as e:
+            self.resync()
             raise ConnectionError(f"Communication failed: {e}")
     
+    def _read(self, expected_length):
+        """Read until expected_length bytes arrive or the timeout expires"""
+        fd = self.ser.fileno()
+        buf = bytearray()
+        deadline = time.monotonic() + self.timeout
+        
+        while len(buf) < expected_length:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._sel.select(timeout=remaining):
+                break
+            chunk = os.read(fd, expected_length - len(buf))
+            if not chunk:
+                raise ConnectionError("Device reported ready to read but returned no data")
+            buf += chunk
+        
+        if len(buf) < expected_length:
+            # Timed out; drop any partial reply so it cannot shift later responses
+            self.resync()
+        
+        return bytes(buf)
+    
     def get_version(self):
-        """Get device version string"""
-        response = self.send_command('<GETVER>>', 14)
-        if len(response) != 14:
-            raise ValueError(f"Invalid version response length: {len(response)}")
-        return response.decode('ascii', errors='ignore').strip()
+        """Get device version string (queried once per connection)"""
+        if self.version is None:
+            response = self.send_command('<GETVER>>', 14)
+            if len(response) != 14:
+                raise ValueError(f"Invalid version response length: {len(response)}")
+            self.version = response.decode('ascii', errors='ignore').strip()
+        return self.version
+    
+    @staticmethod
+    def _decode(response, fmt, name):
+        """Validate response length and unpack it in place via a memoryview"""
+        if len(response) != fmt.size:
+            raise ValueError(f"Invalid {name} response length: {len(response)}")
+        return fmt.unpack_from(memoryview(response))
     
     def get_cpm(self):
         """Get current CPM reading"""
-        response = self.send_command('<GETCPM>>', 2)
-        if len(response) != 2:
-            raise ValueError(f"Invalid CPM response length: {len(response)}")
-        return (response[0] << 8) | response[1]
+        response = self.send_command('<GETCPM>>', self.CPM_RESPONSE.size)
+        cpm, = self._decode(response, self.CPM_RESPONSE, 'CPM')
+        return cpm
     
     def get_battery_voltage(self):
         """Get battery voltage in volts"""
-        response = self.send_command('<GETVOLT>>', 1)
-        if len(response) != 1:
-            raise ValueError(f"Invalid voltage response length: {len(response)}")
-        return response[0] / 10.0
+        response = self.send_command('<GETVOLT>>', self.VOLT_RESPONSE.size)
+        decivolts, = self._decode(response, self.VOLT_RESPONSE, 'voltage')
+        return decivolts / 10.0
+    
+    def read_all_sensors(self):
+        """Get CPM and battery voltage in one back-to-back transaction"""
+        return self.get_cpm(), self.get_battery_voltage()
     
     def set_datetime(self, dt=None):
         """Set device date and time (defaults to current system time)"""
@@ -77,69 +150,201 @@ class GMC300EPlus:
         yy = dt.year % 100
         
         # Format as hexadecimal string
-        datetime_hex = f'{yy:02X}{dt.month:02X}{dt.day:02X}{dt.hour:02X}{dt.minute:02X}{dt.second:02X}'
-        command = f'<SETDATETIME[{datetime_hex}]>>'
+        raw = bytes([yy, dt.month, dt.day, dt.hour, dt.minute, dt.second])
+        command = b'<SETDATETIME[' + raw.hex().upper().encode('ascii') + b']>>'
         
         response = self.send_command(command, 1)
-        if len(response) != 1 or response[0] != 0xAA:
+        if len(response) < 1 or response[-1] != 0xAA:
             raise ValueError("Failed to set date/time - device returned error")
         
         return True
     
     def get_datetime(self):
         """Get device date and time"""
-        response = self.send_command('<GETDATETIME>>', 7)
-        if len(response) != 7 or response[6] != 0xAA:
+        response = self.send_command('<GETDATETIME>>', self.DATETIME_RESPONSE.size)
+        if len(response) < self.DATETIME_RESPONSE.size or response[-1] != 0xAA:
             raise ValueError("Invalid datetime response")
         
+        yy, month, day, hour, minute, second, _ = self.DATETIME_RESPONSE.unpack_from(memoryview(response))
+        
         # Convert 2-digit year to 4-digit (assumes 21st century for years < 50)
-        year = 2000 + response[0] if response[0] < 50 else 1900 + response[0]
+        year = 2000 + yy if yy < 50 else 1900 + yy
         
         return {
             'year': year,
-            'month': response[1],
-            'day': response[2], 
-            'hour': response[3],
-            'minute': response[4],
-            'second': response[5],
-            'datetime': datetime(year, response[1], response[2], 
-                               response[3], response[4], response[5])
+            'month': month,
+            'day': day, 
+            'hour': hour,
+            'minute': minute,
+            'second': second,
+            'datetime': datetime(year, month, day, hour, minute, second)
         }
     
     def disconnect(self):
         """Close serial connection"""
+        self._sel.close()
         if self.ser and self.ser.is_open:
             self.ser.close()
 
 class DataLogger:
-    """CSV data logging for backup and historical analysis"""
+    """CSV or packed binary data logging for backup and historical analysis"""
+    
+    # timestamp, cpm, uSv/h, battery voltage in decivolts, battery percent
+    BINARY_RECORD = struct.Struct('<dIfBB')
+    # Identifies a binary log; records follow immediately after it
+    BINARY_MAGIC = b'GMCBIN1\n'
     
-    def __init__(self, log_file, max_file_size_mb=100):
+    def __init__(self, log_file, max_file_size_mb=100, log_format='csv'):
+        if log_format not in ('csv', 'binary'):
+            raise ValueError(f"Unknown data log format: {log_format}")
         self.log_file = log_file
         self.max_file_size = max_file_size_mb * 1024 * 1024
-        self.fieldnames = [
+        self.binary = log_format == 'binary'
+        self.fieldnames = (
             'timestamp', 'datetime', 'cpm', 'uSv_h', 
             'battery_voltage', 'battery_percent'
-        ]
-        self._ensure_log_file()
+        )
+        self._fd = None
+        self._bytes_written = 0
+        self._open_log_file()
+        
+        # Rows are written by a background thread so disk I/O never blocks polling
+        self._q = queue.Queue(maxsize=1024)
+        self._thread = Thread(target=self._drain_queue, name='DataLogger', daemon=True)
+        self._thread.start()
     
-    def _ensure_log_file(self):
-        """Create log file with headers if it doesn't exist"""
-        if not os.path.exists(self.log_file):
-            with open(self.log_file, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=self.fieldnames)
-                writer.writeheader()
+    def _open_log_file(self):
+        """Open log file for appending, writing headers if it is new"""
+        if self.binary:
+            self._check_binary_log()
+        
+        self._fd = os.open(self.log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._bytes_written = os.fstat(self._fd).st_size
+        if self._bytes_written == 0:
+            if self.binary:
+                header = self.BINARY_MAGIC
+            else:
+                header = (','.join(self.fieldnames) + '\n').encode('ascii')
+            self._write_all(header)
     
-    def log_reading(self, data):
-        """Log a reading to CSV file"""
+    def _check_binary_log(self):
+        """Make an existing binary log safe to append to
+        
+        A file without the binary header (e.g. an old CSV log) is moved
+        aside. A torn trailing record, as left by a power cut, is truncated
+        so later records stay aligned.
+        """
         try:
-            # Rotate log file if too large
-            if os.path.getsize(self.log_file) > self.max_file_size:
+            size = os.path.getsize(self.log_file)
+        except FileNotFoundError:
+            return
+        if size == 0:
+            return
+        
+        header_size = len(self.BINARY_MAGIC)
+        with open(self.log_file, 'rb') as f:
+            magic = f.read(header_size)
+        
+        if magic != self.BINARY_MAGIC:
+            archived_file = self._archive_log_file()
+            logging.warning(f"{self.log_file} is not a binary data log, moved to {archived_file}")
+            return
+        
+        whole = header_size + (size - header_size) // self.BINARY_RECORD.size * self.BINARY_RECORD.size
+        if whole != size:
+            os.truncate(self.log_file, whole)
+            logging.warning(f"Truncated {size - whole} bytes of a partial record from {self.log_file}")
+    
+    def _archive_log_file(self):
+        """Move the current log file aside and return its new name"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        archived_file = f"{self.log_file}.{timestamp}"
+        # Never overwrite an earlier archive from the same second
+        suffix = 1
+        while os.path.exists(archived_file):
+            archived_file = f"{self.log_file}.{timestamp}_{suffix}"
+            suffix += 1
+        os.rename(self.log_file, archived_file)
+        return archived_file
+    
+    def _write_all(self, data):
+        """Write data to the log, retrying short writes until all of it is on disk"""
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            self._bytes_written += written
+            view = view[written:]
+    
+    @staticmethod
+    def _format_row(row):
+        """Format a reading as one CSV line (fixed numeric schema, no quoting needed)"""
+        ts, dt, cpm, usvh, voltage, percent = row
+        return f"{ts:.3f},{dt},{cpm},{usvh:.3f},{voltage:.1f},{percent}\n"
+    
+    def _encode_rows(self, rows):
+        """Encode a batch of readings in the configured log format"""
+        if self.binary:
+            pack = self.BINARY_RECORD.pack
+            return b''.join(
+                pack(ts, cpm, usvh, int(round(voltage * 10)), percent)
+                for ts, _, cpm, usvh, voltage, percent in rows
+            )
+        return ''.join(map(self._format_row, rows)).encode('utf-8')
+    
+    def log_reading(self, row):
+        """Queue a reading for the CSV file (row values in fieldnames order)"""
+        try:
+            self._q.put_nowait(row)
+        except queue.Full:
+            # Drop the oldest queued row rather than blocking the poll loop
+            try:
+                self._q.get_nowait()
+            except queue.Empty:
+                pass
+            logging.warning("Data log queue full, dropping oldest reading")
+            try:
+                self._q.put_nowait(row)
+            except queue.Full:
+                pass
+    
+    def _drain_queue(self):
+        """Write queued rows to disk, coalescing whatever is pending into one batch"""
+        while True:
+            row = self._q.get()
+            batch = [row]
+            while True:
+                try:
+                    batch.append(self._q.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = None in batch
+            if stop:
+                batch = batch[:batch.index(None)]
+            
+            if batch:
+                self._write_rows(batch)
+            if stop:
+                return
+    
+    def _write_rows(self, rows):
+        """Append a batch of rows to the log file"""
+        try:
+            # Reopen if an earlier rotation could not, otherwise rotate if too large
+            if self._fd is None:
+                self._open_log_file()
+            elif self._bytes_written > self.max_file_size:
                 self._rotate_log_file()
             
-            with open(self.log_file, 'a', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=self.fieldnames)
-                writer.writerow(data)
+            start = self._bytes_written
+            try:
+                self._write_all(self._encode_rows(rows))
+            except OSError:
+                # Drop a partially written batch so binary records stay aligned
+                if self.binary:
+                    os.ftruncate(self._fd, start)
+                    self._bytes_written = start
+                raise
                 
         except Exception as e:
             logging.error(f"Failed to log data: {e}")
@@ -147,38 +352,45 @@ class DataLogger:
     def _rotate_log_file(self):
         """Rotate log file when it gets too large"""
         try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            archived_file = f"{self.log_file}.{timestamp}"
-            os.rename(self.log_file, archived_file)
-            self._ensure_log_file()
+            # Forget the descriptor at once; the kernel may reuse its number elsewhere
+            fd, self._fd = self._fd, None
+            os.close(fd)
+            archived_file = self._archive_log_file()
             logging.info(f"Log file rotated to {archived_file}")
         except Exception as e:
             logging.error(f"Failed to rotate log file: {e}")
+        finally:
+            self._open_log_file()
+    
+    def close(self):
+        """Write any queued rows, stop the writer thread and close the log file"""
+        if self._thread.is_alive():
+            self._q.put(None)
+            self._thread.join()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
     
     def export_data(self, start_date=None, end_date=None, output_file=None):
-        """Export historical data within date range"""
+        """Export historical data within date range as CSV"""
+        import csv  # Only needed when exporting
+        
         if not output_file:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             output_file = f"gmc_export_{timestamp}.csv"
         
+        # Filter on the epoch timestamp column; no per-row datetime parsing
+        start_ts = start_date.timestamp() if start_date else None
+        end_ts = end_date.timestamp() if end_date else None
+        
         try:
-            with open(self.log_file, 'r') as infile, open(output_file, 'w', newline='') as outfile:
-                reader = csv.DictReader(infile)
-                writer = csv.DictWriter(outfile, fieldnames=self.fieldnames)
-                writer.writeheader()
-                
-                for row in reader:
-                    if start_date or end_date:
-                        try:
-                            row_time = datetime.fromisoformat(row['datetime'])
-                            if start_date and row_time < start_date:
-                                continue
-                            if end_date and row_time > end_date:
-                                continue
-                        except (ValueError, KeyError):
-                            continue
-                    
-                    writer.writerow(row)
+            with open(output_file, 'w', newline='') as outfile:
+                writer = csv.writer(outfile)
+                writer.writerow(self.fieldnames)
+                if self.binary:
+                    self._export_binary_rows(writer, start_ts, end_ts)
+                else:
+                    self._export_csv_rows(writer, start_ts, end_ts)
             
             logging.info(f"Data exported to {output_file}")
             return output_file
@@ -186,54 +398,120 @@ class DataLogger:
         except Exception as e:
             logging.error(f"Failed to export data: {e}")
             return None
+    
+    def _export_csv_rows(self, writer, start_ts, end_ts):
+        """Copy CSV log rows within the timestamp range to writer"""
+        import csv
+        
+        timestamp_index = self.fieldnames.index('timestamp')
+        
+        with open(self.log_file, 'r', newline='') as infile:
+            reader = csv.reader(infile)
+            next(reader, None)  # Skip header
+            
+            for row in reader:
+                if start_ts is not None or end_ts is not None:
+                    try:
+                        row_time = float(row[timestamp_index])
+                    except (ValueError, IndexError):
+                        continue
+                    if start_ts is not None and row_time < start_ts:
+                        continue
+                    if end_ts is not None and row_time > end_ts:
+                        continue
+                
+                writer.writerow(row)
+    
+    def _export_binary_rows(self, writer, start_ts, end_ts):
+        """Decode binary log records within the timestamp range and write them as CSV"""
+        record_size = self.BINARY_RECORD.size
+        header_size = len(self.BINARY_MAGIC)
+        
+        with open(self.log_file, 'rb') as infile:
+            if infile.read(header_size) != self.BINARY_MAGIC:
+                raise ValueError(f"{self.log_file} is not a binary data log")
+            
+            # Ignore a trailing partial record, e.g. from an interrupted write
+            size = os.fstat(infile.fileno()).st_size
+            usable = header_size + (size - header_size) // record_size * record_size
+            if usable == header_size:
+                return
+            
+            with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view, view[header_size:usable] as records:
+                    for ts, cpm, usvh, decivolts, percent in self.BINARY_RECORD.iter_unpack(records):
+                        if start_ts is not None and ts < start_ts:
+                            continue
+                        if end_ts is not None and ts > end_ts:
+                            continue
+                        
+                        writer.writerow((
+                            f"{ts:.3f}",
+                            datetime.fromtimestamp(ts).isoformat(timespec='seconds'),
+                            cpm,
+                            f"{usvh:.3f}",
+                            f"{decivolts / 10:.1f}",
+                            percent
+                        ))
 
 class AlertManager:
     """Handle configurable alerting"""
     
+    __slots__ = (
+        '_alert_first', '_alert_last', '_high_thr', '_high_duration',
+        '_batt_enabled', '_low_batt', '_crit_batt'
+    )
+    
     def __init__(self, config):
-        self.config = config
-        self.alert_states = {}
-        self.last_alerts = {}
+        # When each condition was first seen and when it last alerted (0.0 = never)
+        self._alert_first = {'high_radiation': 0.0, 'low_battery': 0.0}
+        self._alert_last = {'high_radiation': 0.0, 'low_battery': 0.0}
+        
+        # Resolve thresholds once rather than on every check
+        self._high_thr = config.get('high_radiation_threshold_usvh')
+        self._high_duration = config.get('high_radiation_duration_minutes', 0) * 60
+        self._batt_enabled = config.get('enable_battery_alerts', True)
+        self._low_batt = config.get('low_battery_threshold_volts', 6.0)
+        self._crit_batt = config.get('critical_battery_threshold_volts', 5.5)
+    
+    @staticmethod
+    def _make_alert(alert_type, message, level):
+        """Build an alert as a (type, message, level) tuple"""
+        return (alert_type, message, level)
     
     def check_alerts(self, data):
         """Check all configured alert conditions"""
         alerts = []
         
         # High radiation alert
-        if self.config.get('high_radiation_threshold_usvh'):
-            threshold = self.config['high_radiation_threshold_usvh']
-            duration = self.config.get('high_radiation_duration_minutes', 0) * 60
+        if self._high_thr:
+            threshold = self._high_thr
             
             if data['uSv_h'] > threshold:
-                alert_key = 'high_radiation'
-                if self._should_trigger_alert(alert_key, duration):
-                    alerts.append({
-                        'type': 'high_radiation',
-                        'message': f"High radiation detected: {data['uSv_h']:.3f} µSv/h (threshold: {threshold})",
-                        'level': 'warning',
-                        'data': data
-                    })
+                if self._should_trigger_alert('high_radiation', self._high_duration):
+                    alerts.append(self._make_alert(
+                        'high_radiation',
+                        f"High radiation detected: {data['uSv_h']:.3f} µSv/h (threshold: {threshold})",
+                        'warning'
+                    ))
             else:
                 self._clear_alert_state('high_radiation')
         
         # Battery alerts
-        if self.config.get('enable_battery_alerts', True):
-            if data['battery_voltage'] < self.config.get('critical_battery_threshold_volts', 5.5):
-                alerts.append({
-                    'type': 'critical_battery',
-                    'message': f"Critical battery level: {data['battery_voltage']:.1f}V",
-                    'level': 'critical',
-                    'data': data
-                })
-            elif data['battery_voltage'] < self.config.get('low_battery_threshold_volts', 6.0):
-                alert_key = 'low_battery'
-                if self._should_trigger_alert(alert_key, 300):  # 5 min delay
-                    alerts.append({
-                        'type': 'low_battery',
-                        'message': f"Low battery: {data['battery_voltage']:.1f}V",
-                        'level': 'warning',
-                        'data': data
-                    })
+        if self._batt_enabled:
+            if data['battery_voltage'] < self._crit_batt:
+                alerts.append(self._make_alert(
+                    'critical_battery',
+                    f"Critical battery level: {data['battery_voltage']:.1f}V",
+                    'critical'
+                ))
+            elif data['battery_voltage'] < self._low_batt:
+                if self._should_trigger_alert('low_battery', 300):  # 5 min delay
+                    alerts.append(self._make_alert(
+                        'low_battery',
+                        f"Low battery: {data['battery_voltage']:.1f}V",
+                        'warning'
+                    ))
         
         return alerts
     
@@ -241,34 +519,74 @@ class AlertManager:
         """Check if alert should trigger based on duration"""
         current_time = time.time()
         
-        if alert_key not in self.alert_states:
-            self.alert_states[alert_key] = current_time
+        first_seen = self._alert_first[alert_key]
+        if not first_seen:
+            first_seen = self._alert_first[alert_key] = current_time
         
         # Check if enough time has passed
-        if current_time - self.alert_states[alert_key] >= min_duration:
+        if current_time - first_seen >= min_duration:
             # Check if we haven't sent this alert recently (avoid spam)
-            if alert_key not in self.last_alerts or current_time - self.last_alerts[alert_key] > 3600:
-                self.last_alerts[alert_key] = current_time
+            if current_time - self._alert_last[alert_key] > 3600:
+                self._alert_last[alert_key] = current_time
                 return True
         
         return False
     
     def _clear_alert_state(self, alert_key):
         """Clear alert state when condition is no longer met"""
-        if alert_key in self.alert_states:
-            del self.alert_states[alert_key]
+        self._alert_first[alert_key] = 0.0
 
 class GMCMonitor:
     def __init__(self, config_file='gmc_config.json'):
         self.config = self.load_config(config_file)
-        self.mqtt_client = mqtt.Client()
+        self.mqtt_client = mqtt.Client(
+            callback_api_version=mqtt.CallbackAPIVersion.VERSION2,
+            client_id=self.config['mqtt']['client_id'],
+            clean_session=False
+        )
+        # Let the network thread pipeline publishes instead of one at a time
+        self.mqtt_client.max_inflight_messages_set(100)
+        self.mqtt_client.max_queued_messages_set(1000)
         self.device = None
-        self.running = Event()
+        self._stop = Event()
         self.data_logger = None
         self.alert_manager = AlertManager(self.config.get('alerts', {}))
         self.setup_logging()
         self.setup_data_logging()
         self.connection_start_time = time.time()
+        self._polls_since_drift_check = 0
+        
+        # Flatten config values used on every poll
+        device_config = self.config['device']
+        self._cpm_factor = device_config['cpm_to_usvh_factor']
+        self._drift_check = device_config['check_time_drift']
+        self._max_drift = device_config['max_time_drift_seconds']
+        self._auto_resync = device_config['sync_datetime_on_start']
+        monitoring_config = self.config['monitoring']
+        self._update_interval = monitoring_config['update_interval_seconds']
+        self._batt_full = monitoring_config['battery_full_voltage']
+        self._batt_empty = monitoring_config['battery_empty_voltage']
+        # Voltage span for linear interpolation between empty and full
+        self._batt_span = self._batt_full - self._batt_empty
+        self._polls_per_drift_check = max(
+            1, int(device_config['time_drift_check_interval_seconds'] // max(self._update_interval, 1))
+        )
+        
+        # MQTT topics are fixed for the lifetime of the process
+        mqtt_config = self.config['mqtt']
+        self._state_topic = f"{mqtt_config['topic_prefix']}/state"
+        self._availability_topic = mqtt_config['availability_topic']
+        self._discovery_prefix = mqtt_config['discovery_prefix']
+        
+        # Compact JSON encoder shared by every publish, returning bytes
+        if orjson:
+            self._encoder = orjson.dumps
+        else:
+            compact_encode = json.JSONEncoder(separators=(',', ':')).encode
+            self._encoder = lambda obj: compact_encode(obj).encode('utf-8')
+        
+        # Discovery configs are static, so serialize them once for every reconnect
+        self._discovery_msgs = self._build_discovery_msgs()
     
     def load_config(self, config_file):
         """Load configuration from JSON file"""
@@ -279,6 +597,7 @@ class GMCMonitor:
                 "sync_datetime_on_start": True,
                 "check_time_drift": True,
                 "max_time_drift_seconds": 300,
+                "time_drift_check_interval_seconds": 3600,
                 "cpm_to_usvh_factor": 0.0057
             },
             "mqtt": {
@@ -293,7 +612,8 @@ class GMCMonitor:
                 "cert_file": None,
                 "key_file": None,
                 "insecure": False,
-                "availability_topic": "homeassistant/sensor/gmc300e/availability"
+                "availability_topic": "homeassistant/sensor/gmc300e/availability",
+                "client_id": "gmc300e_monitor"
             },
             "monitoring": {
                 "update_interval_seconds": 60,
@@ -309,7 +629,9 @@ class GMCMonitor:
             "data_logging": {
                 "enabled": True,
                 "csv_file": "gmc_data.csv",
+                "binary_file": "gmc_data.bin",
                 "max_file_size_mb": 100,
+                "format": "csv",
                 "enable_export": True
             },
             "alerts": {
@@ -351,14 +673,16 @@ class GMCMonitor:
         return config
     
     def _merge_config(self, default, user):
-        """Recursively merge user config with defaults"""
-        result = default.copy()
-        for key, value in user.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._merge_config(result[key], value)
-            else:
-                result[key] = value
-        return result
+        """Merge user config into defaults in place, walking nested dicts iteratively"""
+        stack = [(default, user)]
+        while stack:
+            target, overrides = stack.pop()
+            for key, value in overrides.items():
+                if isinstance(value, dict) and isinstance(target.get(key), dict):
+                    stack.append((target[key], value))
+                else:
+                    target[key] = value
+        return default
     
     def setup_logging(self):
         log_config = self.config['logging']
@@ -376,11 +700,14 @@ class GMCMonitor:
         self.logger = logging.getLogger(__name__)
     
     def setup_data_logging(self):
-        """Initialize CSV data logging if enabled"""
-        if self.config['data_logging']['enabled']:
+        """Initialize CSV or binary data logging if enabled"""
+        data_config = self.config['data_logging']
+        if data_config['enabled']:
+            log_format = data_config['format']
             self.data_logger = DataLogger(
-                self.config['data_logging']['csv_file'],
-                self.config['data_logging']['max_file_size_mb']
+                data_config['binary_file'] if log_format == 'binary' else data_config['csv_file'],
+                data_config['max_file_size_mb'],
+                log_format
             )
     
     def setup_mqtt_ssl(self):
@@ -388,6 +715,8 @@ class GMCMonitor:
         mqtt_config = self.config['mqtt']
         
         if mqtt_config.get('use_ssl', False):
+            import ssl  # Only needed for TLS connections
+            
             context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
             
             if mqtt_config.get('ca_cert'):
@@ -450,14 +779,19 @@ class GMCMonitor:
     
     def publish_availability(self, available):
         """Publish device availability status"""
-        availability_topic = self.config['mqtt']['availability_topic']
         payload = "online" if available else "offline"
-        self.mqtt_client.publish(availability_topic, payload, retain=True)
+        self.mqtt_client.publish(self._availability_topic, payload, retain=True)
     
     def publish_discovery(self):
         """Publish Home Assistant MQTT discovery configs"""
+        for topic, payload in self._discovery_msgs:
+            self.mqtt_client.publish(topic, payload, qos=1, retain=True)
+            
+        self.logger.info("Published MQTT discovery configs")
+    
+    def _build_discovery_msgs(self):
+        """Build (topic, payload) pairs for Home Assistant discovery"""
         ha_config = self.config['homeassistant']
-        mqtt_config = self.config['mqtt']
         
         device_info = {
             "identifiers": [ha_config['device_identifier']],
@@ -466,14 +800,11 @@ class GMCMonitor:
             "manufacturer": ha_config['device_manufacturer']
         }
         
-        state_topic = f"{mqtt_config['topic_prefix']}/state"
-        availability_topic = mqtt_config['availability_topic']
-        
         # Base sensor configuration
         base_sensor_config = {
             "device": device_info,
-            "availability_topic": availability_topic,
-            "state_topic": state_topic
+            "availability_topic": self._availability_topic,
+            "state_topic": self._state_topic
         }
         
         # Define all sensors
@@ -513,95 +844,83 @@ class GMCMonitor:
             }
         ]
         
-        # Publish discovery configs
-        discovery_prefix = mqtt_config['discovery_prefix']
+        # Serialize discovery configs
+        messages = []
         for sensor in sensors:
             config = {**base_sensor_config, **sensor}
-            topic = f"{discovery_prefix}/sensor/{sensor['unique_id']}/config"
-            self.mqtt_client.publish(topic, json.dumps(config), retain=True)
-            
-        self.logger.info("Published MQTT discovery configs")
+            topic = f"{self._discovery_prefix}/sensor/{sensor['unique_id']}/config"
+            messages.append((topic, self._encoder(config)))
+        
+        return messages
     
     def calculate_battery_percentage(self, voltage):
         """Convert voltage to battery percentage based on config"""
-        battery_config = self.config['monitoring']
-        full_voltage = battery_config['battery_full_voltage']
-        empty_voltage = battery_config['battery_empty_voltage']
-        
-        if voltage >= full_voltage:
+        if voltage >= self._batt_full:
             return 100
-        elif voltage <= empty_voltage:
+        elif voltage <= self._batt_empty:
             return 0
         else:
-            # Linear interpolation between empty and full
-            percentage = ((voltage - empty_voltage) / (full_voltage - empty_voltage)) * 100
-            return max(0, min(100, int(percentage)))
+            return int((voltage - self._batt_empty) / self._batt_span * 100)
     
     def read_and_publish(self):
         """Read all sensor data and publish to MQTT"""
         try:
-            # Get radiation reading
-            cpm = self.device.get_cpm()
-            
-            # Get battery status
-            voltage = self.device.get_battery_voltage()
+            # Get radiation reading and battery status
+            cpm, voltage = self.device.read_all_sensors()
             battery_percent = self.calculate_battery_percentage(voltage)
             
             # Calculate dose rate using configured conversion factor
-            device_config = self.config['device']
-            usvh = cpm * device_config['cpm_to_usvh_factor']
+            usvh = cpm * self._cpm_factor
             
-            # Check device time drift if configured
-            if device_config['check_time_drift']:
+            # Check device time drift if configured, on its own slower cadence
+            if self._drift_check and self._drift_check_due():
                 try:
                     device_time = self.device.get_datetime()
                     time_drift = abs((datetime.now() - device_time['datetime']).total_seconds())
-                    max_drift = device_config['max_time_drift_seconds']
                     
-                    if time_drift > max_drift:
+                    if time_drift > self._max_drift:
                         self.logger.warning(f"Device time drift: {time_drift:.0f} seconds")
-                        if device_config['sync_datetime_on_start']:  # Only auto-sync if enabled
+                        if self._auto_resync:  # Only auto-sync if enabled
                             self.device.set_datetime()
                             self.logger.info("Device time re-synchronized")
                 except Exception as e:
-                    self.logger.debug(f"Time check failed: {e}")
+                    # A bad or late reply must not be read by the next command
+                    self.device.resync()
+                    self.logger.warning(f"Time check failed: {e}")
             
             # Prepare main payload
-            current_time = datetime.now()
+            timestamp = time.time()
             payload = {
                 "cpm": cpm,
                 "uSv_h": round(usvh, 3),
                 "battery_voltage": round(voltage, 1),
                 "battery_percent": battery_percent,
                 "connection_status": "Connected",
-                "timestamp": time.time(),
-                "last_updated": current_time.isoformat()
+                "timestamp": timestamp,
+                "last_updated": datetime.fromtimestamp(timestamp).isoformat(timespec='seconds')
             }
             
             # Log to CSV if enabled
             if self.data_logger:
-                csv_data = {
-                    'timestamp': payload['timestamp'],
-                    'datetime': payload['last_updated'],
-                    'cpm': cpm,
-                    'uSv_h': payload['uSv_h'],
-                    'battery_voltage': payload['battery_voltage'],
-                    'battery_percent': battery_percent
-                }
-                self.data_logger.log_reading(csv_data)
+                self.data_logger.log_reading((
+                    payload['timestamp'],
+                    payload['last_updated'],
+                    cpm,
+                    payload['uSv_h'],
+                    payload['battery_voltage'],
+                    battery_percent
+                ))
             
             # Check for alerts
             alerts = self.alert_manager.check_alerts(payload)
-            for alert in alerts:
+            for _, message, level in alerts:
                 self.logger.log(
-                    logging.WARNING if alert['level'] == 'warning' else logging.ERROR,
-                    alert['message']
+                    logging.WARNING if level == 'warning' else logging.ERROR,
+                    message
                 )
             
             # Publish to MQTT
-            mqtt_config = self.config['mqtt']
-            state_topic = f"{mqtt_config['topic_prefix']}/state"
-            self.mqtt_client.publish(state_topic, json.dumps(payload), retain=True)
+            self.mqtt_client.publish(self._state_topic, self._encoder(payload), qos=0, retain=True)
             
             self.logger.info(
                 f"Published: {cpm} CPM ({usvh:.3f} µSv/h), "
@@ -612,6 +931,12 @@ class GMCMonitor:
             self.logger.error(f"Reading failed: {e}")
             self.reconnect_device()
     
+    def _drift_check_due(self):
+        """Return True once every time_drift_check_interval_seconds worth of polls"""
+        due = self._polls_since_drift_check == 0
+        self._polls_since_drift_check = (self._polls_since_drift_check + 1) % self._polls_per_drift_check
+        return due
+    
     def reconnect_device(self):
         """Reconnect to device after failure"""
         self.logger.info("Attempting to reconnect...")
@@ -624,27 +949,31 @@ class GMCMonitor:
                 pass
             self.device = None
         
-        time.sleep(5)
+        if self._stop.wait(5):
+            return
         self.connect_device()
     
-    def on_mqtt_connect(self, client, userdata, flags, rc):
+    def on_mqtt_connect(self, client, userdata, flags, reason_code, properties):
         """MQTT connection callback"""
-        if rc == 0:
+        if not reason_code.is_failure:
             self.logger.info("Connected to MQTT broker")
             # Set LWT (Last Will and Testament) for availability
-            availability_topic = self.config['mqtt']['availability_topic']
-            client.will_set(availability_topic, "offline", retain=True)
+            client.will_set(self._availability_topic, "offline", retain=True)
         else:
-            self.logger.error(f"MQTT connection failed with code {rc}")
+            self.logger.error(f"MQTT connection failed with code {reason_code}")
     
-    def on_mqtt_disconnect(self, client, userdata, rc):
+    def on_mqtt_disconnect(self, client, userdata, disconnect_flags, reason_code, properties):
         """MQTT disconnection callback"""
-        self.logger.warning(f"Disconnected from MQTT broker (code: {rc})")
+        self.logger.warning(f"Disconnected from MQTT broker (code: {reason_code})")
+    
+    def _request_stop(self, signum, frame):
+        """Signal handler that ends the main loop"""
+        self.logger.info(f"Shutdown requested (signal {signum})")
+        self._stop.set()
     
     def run(self):
         """Main monitoring loop"""
         mqtt_config = self.config['mqtt']
-        monitoring_config = self.config['monitoring']
         
         # Setup MQTT callbacks
         self.mqtt_client.on_connect = self.on_mqtt_connect
@@ -662,8 +991,7 @@ class GMCMonitor:
                 )
             
             # Set availability LWT before connecting
-            availability_topic = mqtt_config['availability_topic']
-            self.mqtt_client.will_set(availability_topic, "offline", retain=True)
+            self.mqtt_client.will_set(self._availability_topic, "offline", retain=True)
             
             self.mqtt_client.connect(
                 mqtt_config['broker'], 
@@ -682,25 +1010,30 @@ class GMCMonitor:
             return
         
         # Main monitoring loop
-        self.running.set()
-        update_interval = monitoring_config['update_interval_seconds']
+        self._stop.clear()
+        signal.signal(signal.SIGTERM, self._request_stop)
+        update_interval = self._update_interval
         
         try:
-            while self.running.is_set():
+            while not self._stop.is_set():
                 try:
                     self.read_and_publish()
-                    time.sleep(update_interval)
+                    # Returns early (True) as soon as a stop is requested
+                    if self._stop.wait(timeout=update_interval):
+                        break
                 except KeyboardInterrupt:
                     self.logger.info("Shutdown requested")
-                    self.running.clear()
+                    self._stop.set()
                 except Exception as e:
                     self.logger.error(f"Unexpected error: {e}")
-                    time.sleep(10)  # Wait before retry
+                    self._stop.wait(10)  # Wait before retry
         finally:
             # Cleanup
             self.publish_availability(False)
             if self.device:
                 self.device.disconnect()
+            if self.data_logger:
+                self.data_logger.close()
             self.mqtt_client.loop_stop()
             self.mqtt_client.disconnect()
             self.logger.info("Monitor stopped")
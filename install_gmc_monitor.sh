@@ -55,7 +55,8 @@ cd $INSTALL_DIR
 python3 -m venv venv
 source venv/bin/activate
 pip install --upgrade pip
-pip install paho-mqtt pyserial
+pip install "paho-mqtt>=2.0" pyserial
+pip install orjson || echo -e "${YELLOW}orjson unavailable, using standard json module${NC}"
 
 # Configure Mosquitto
 echo -e "${YELLOW}Configuring MQTT broker...${NC}"